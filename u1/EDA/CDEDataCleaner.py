@@ -1,6 +1,6 @@
 import warnings
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 import pandas as pd
@@ -11,9 +11,15 @@ warnings.filterwarnings('ignore')
 class CDEDataCleaner:
     """Limpiador especializado para el dataset CDE.xlsx"""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, hours_tolerance: Optional[float] = None):
+        if hours_tolerance is not None and not hours_tolerance > 0:
+            raise ValueError(f"hours_tolerance debe ser None o mayor que 0, se recibió {hours_tolerance}")
         self.file_path = file_path
+        self.hours_tolerance = hours_tolerance
         self.df = None
+        self.imputed_rows = None
+        self.app_problems = {}
+        self.removed_near_duplicates = pd.Index([])
         self.cleaning_log = []
 
     def load_and_clean(self) -> pd.DataFrame:
@@ -29,13 +35,17 @@ class CDEDataCleaner:
         except Exception as e:
             raise Exception(f"Error al cargar el archivo: {e}")
 
-        # 2-8. Proceso de limpieza
+        # 2-12. Proceso de limpieza
         self.df = self._remove_empty_columns()
         self.df = self._remove_empty_rows()
         self.df = self._standardize_column_names()
         self.df = self._standardize_categorical_values()
+        self.df = self._parse_app_columns()
+        self.df = self._parse_age_column()
+        self.df = self._remove_duplicates()
         self.df = self._clean_app_columns()
         self.df = self._clean_age_column()
+        self.df = self._remove_near_duplicates()
         self._generate_cleaning_report()
 
         return self.df
@@ -94,13 +104,10 @@ class CDEDataCleaner:
 
         return self.df
 
-    def _clean_app_columns(self) -> pd.DataFrame:
-        """Limpia columnas de apps - CRÍTICO."""
-        app_columns = ['Facebook', 'Instagram', 'TikTok', 'Youtube',
-                       'Twitter_X', 'Spotify', 'WhatsApp']
-
-        for col in app_columns:
-            if col not in self.df.columns:
+    def _parse_app_columns(self) -> pd.DataFrame:
+        """Convierte las columnas de apps a horas numéricas, sin imputar."""
+        for col in self.get_app_columns():
+            if col not in self.df.columns or pd.api.types.is_float_dtype(self.df[col]):
                 continue
 
             problemas_detectados = 0
@@ -123,32 +130,123 @@ class CDEDataCleaner:
                         return np.nan
                 return np.nan
 
-            self.df[col] = self.df[col].apply(clean_value)
+            self.df[col] = self.df[col].apply(clean_value).astype(float)
+            self.app_problems[col] = problemas_detectados
+
+        return self.df
+
+    def _parse_age_column(self) -> pd.DataFrame:
+        """Convierte la edad a numérica, sin imputar."""
+        if 'Edad' in self.df.columns:
+            self.df['Edad'] = pd.to_numeric(self.df['Edad'], errors='coerce')
+        return self.df
+
+    def _clean_app_columns(self) -> pd.DataFrame:
+        """Limpia columnas de apps - CRÍTICO."""
+        self.df = self._parse_app_columns()
+        self.imputed_rows = pd.Series(False, index=self.df.index)
+
+        for col in self.get_app_columns():
+            if col not in self.df.columns:
+                continue
 
             if self.df[col].notna().sum() > 0:
                 median_val = self.df[col].median()
                 nulls_before = self.df[col].isnull().sum()
+                self.imputed_rows |= self.df[col].isnull()
                 self.df[col] = self.df[col].fillna(median_val)
                 self.cleaning_log.append(
-                    f"✓ {col}: {problemas_detectados} valores anómalos detectados, "
+                    f"✓ {col}: {self.app_problems.get(col, 0)} valores anómalos detectados, "
                     f"{nulls_before} imputados con mediana ({median_val:.2f})"
                 )
 
-            self.df[col] = self.df[col].astype(float)
-
         return self.df
 
     def _clean_age_column(self) -> pd.DataFrame:
         """Limpia la columna de edad."""
         if 'Edad' in self.df.columns:
-            self.df['Edad'] = pd.to_numeric(self.df['Edad'], errors='coerce')
+            self.df = self._parse_age_column()
             if self.df['Edad'].isnull().any():
+                if self.imputed_rows is not None:
+                    self.imputed_rows |= self.df['Edad'].isnull()
                 median_age = self.df['Edad'].median()
                 self.df['Edad'] = self.df['Edad'].fillna(median_age)
             self.df['Edad'] = self.df['Edad'].astype(int)
             self.cleaning_log.append(f"✓ Edad limpiada y convertida a entero")
         return self.df
 
+    def _remove_duplicates(self) -> pd.DataFrame:
+        """Elimina respuestas duplicadas exactas.
+
+        Se ejecuta con los valores ya normalizados y convertidos a número, pero
+        antes de imputar, para que dos respuestas distintas con celdas vacías no
+        coincidan por la mediana. Cada fila se resume en un hash vectorizado.
+        """
+        row_hashes = pd.util.hash_pandas_object(self.df, index=False)
+        exact_mask = row_hashes.duplicated(keep='first').to_numpy()
+        removed = int(exact_mask.sum())
+        self.df = self.df.loc[~exact_mask].copy()
+        if removed > 0:
+            self.cleaning_log.append(f"✓ Eliminados {removed} registros duplicados exactos")
+        return self.df
+
+    def _remove_near_duplicates(self) -> pd.DataFrame:
+        """Elimina respuestas casi idénticas (opcional, ver ``hours_tolerance``).
+
+        Las horas de cada app se ajustan a una rejilla de ancho
+        ``hours_tolerance`` cuyas celdas se añaden a las claves categóricas de
+        bloqueo; de cada bloque se conserva la primera fila. Una segunda
+        rejilla desplazada ``hours_tolerance / 2`` recupera los pares separados
+        por un borde de la primera. Toda fila eliminada difiere de una
+        conservada en menos de ``hours_tolerance`` en cada app, pero un par
+        cortado por un borde en ambas rejillas (en apps distintas) no se
+        detecta. Las filas con valores imputados no participan.
+        """
+        if self.hours_tolerance is None:
+            return self.df
+
+        block_keys = [col for col in ['Edad', 'Genero', 'Foraneo', 'Estatus', 'Sistema_Operativo']
+                      if col in self.df.columns]
+        app_cols = [col for col in self.get_app_columns() if col in self.df.columns]
+        if not block_keys or not app_cols:
+            return self.df
+
+        candidates = self.df
+        if self.imputed_rows is not None:
+            candidates = self.df.loc[~self.imputed_rows.reindex(self.df.index, fill_value=False)]
+
+        blocks = candidates[block_keys].reset_index(drop=True)
+        hours = candidates[app_cols].to_numpy(dtype=float)
+
+        # Primera rejilla
+        keys = pd.concat([blocks, pd.DataFrame(np.floor(hours / self.hours_tolerance), columns=app_cols)], axis=1)
+        first_pass = keys.duplicated(keep='first').to_numpy()
+        anchors = ~first_pass & keys.duplicated(keep=False).to_numpy()
+
+        # Segunda rejilla, solo sobre las filas conservadas. Las filas que ya
+        # representan a otras se ordenan primero y nunca se eliminan, para que
+        # ninguna fila quede a más de la tolerancia de la que la reemplaza.
+        offset = np.floor(hours / self.hours_tolerance + 0.5)
+        keys = pd.concat([blocks, pd.DataFrame(offset, columns=app_cols)], axis=1)
+        survivors = np.flatnonzero(~first_pass)
+        order = survivors[np.argsort(~anchors[survivors], kind='stable')]
+        second_pass = np.zeros(len(keys), dtype=bool)
+        second_pass[order] = keys.iloc[order].duplicated(keep='first').to_numpy() & ~anchors[order]
+
+        removed_idx = candidates.index[first_pass | second_pass]
+        self.removed_near_duplicates = removed_idx
+        self.df = self.df.drop(index=removed_idx)
+
+        if len(removed_idx) > 0:
+            sample = ', '.join(str(idx) for idx in removed_idx[:10])
+            if len(removed_idx) > 10:
+                sample += ', …'
+            self.cleaning_log.append(
+                f"✓ Eliminados {len(removed_idx)} registros casi duplicados "
+                f"(tolerancia {self.hours_tolerance} h), índices: {sample}"
+            )
+        return self.df
+
     def _generate_cleaning_report(self):
         """Genera y muestra el reporte de limpieza."""
         print("\n REPORTE DE LIMPIEZA:")
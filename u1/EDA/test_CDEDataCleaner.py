@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from CDEDataCleaner import CDEDataCleaner
+
+APPS = ['Facebook', 'Instagram', 'TikTok', 'Youtube', 'Twitter_X', 'Spotify', 'WhatsApp']
+
+
+def make_cleaner(rows, hours_tolerance=None):
+    """Crea un limpiador con un DataFrame ya normalizado, sin leer archivo."""
+    base = {'Edad': 20, 'Genero': 'F', 'Foraneo': 'No', 'Estatus': 'Si',
+            'Sistema_Operativo': 'Android'}
+    base.update({app: 0.0 for app in APPS})
+    cleaner = CDEDataCleaner('', hours_tolerance=hours_tolerance)
+    cleaner.df = pd.DataFrame([{**base, **row} for row in rows])
+    return cleaner
+
+
+def test_exact_duplicates_removed():
+    cleaner = make_cleaner([{'Facebook': 1.0}, {'Facebook': 1.0}, {'Facebook': 2.0}])
+    df = cleaner._remove_duplicates()
+    assert list(df.index) == [0, 2]
+    assert any('1 registros duplicados exactos' in log for log in cleaner.cleaning_log)
+
+
+def test_near_duplicates_off_by_default():
+    cleaner = make_cleaner([{'Facebook': 1.0}, {'Facebook': 1.05}])
+    assert len(cleaner._remove_near_duplicates()) == 2
+
+
+def test_near_duplicates_do_not_chain():
+    cleaner = make_cleaner([{'Facebook': h} for h in (0.0, 0.2, 0.4, 0.6)], hours_tolerance=0.25)
+    df = cleaner._remove_near_duplicates()
+    kept = df['Facebook'].tolist()
+    # 0.2 se une a 0.0 y 0.6 a 0.4 (segunda rejilla); ninguna fila eliminada
+    # queda a más de la tolerancia de una conservada
+    assert kept == [0.0, 0.4]
+    for h in (0.2, 0.6):
+        assert min(abs(h - k) for k in kept) < 0.25
+
+
+def test_near_duplicates_found_across_columns():
+    cleaner = make_cleaner([
+        {'Facebook': 1.0, 'Instagram': 5.0},
+        {'Facebook': 1.05, 'Instagram': 0.0},
+        {'Facebook': 1.1, 'Instagram': 5.0},
+    ], hours_tolerance=0.25)
+    df = cleaner._remove_near_duplicates()
+    assert list(df.index) == [0, 1]
+    assert list(cleaner.removed_near_duplicates) == [2]
+    assert any('índices: 2' in log for log in cleaner.cleaning_log)
+
+
+def test_imputed_rows_not_matched():
+    cleaner = make_cleaner([{'Facebook': 1.0}, {'Facebook': 1.0}], hours_tolerance=0.25)
+    cleaner.imputed_rows = pd.Series([False, True])
+    assert len(cleaner._remove_near_duplicates()) == 2
+
+
+def test_near_duplicates_grid_coverage():
+    # 0.99 y 1.01 caen en celdas distintas de la primera rejilla y se recuperan
+    # con la segunda. Un par cortado en ambas rejillas (Facebook en la primera,
+    # Instagram en la segunda) no se detecta.
+    cleaner = make_cleaner([
+        {'Facebook': 0.99, 'Instagram': 3.0},
+        {'Facebook': 1.01, 'Instagram': 3.0},
+        {'Facebook': 0.99, 'Instagram': 0.865},
+        {'Facebook': 1.01, 'Instagram': 0.885},
+    ], hours_tolerance=0.25)
+    df = cleaner._remove_near_duplicates()
+    assert list(df.index) == [0, 2, 3]
+
+
+def test_near_duplicate_log_is_truncated():
+    cleaner = make_cleaner([{'Facebook': 1.0}] * 25, hours_tolerance=0.25)
+    cleaner._remove_near_duplicates()
+    assert len(cleaner.removed_near_duplicates) == 24
+    log = cleaner.cleaning_log[-1]
+    assert log.startswith('✓ Eliminados 24 registros casi duplicados')
+    assert log.endswith('índices: 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, …')
+
+
+@pytest.mark.parametrize('tolerance', [0, -0.25])
+def test_invalid_tolerance_rejected(tolerance):
+    with pytest.raises(ValueError):
+        CDEDataCleaner('', hours_tolerance=tolerance)
+
+
+def test_imputation_tracked_by_cleaning_stages():
+    cleaner = make_cleaner([
+        {'Facebook': 1.0},
+        {'Facebook': 'abc'},
+        {'Facebook': np.nan},
+        {'Facebook': 1.0, 'Edad': 'veinte'},
+        {'Facebook': 1.0},
+    ], hours_tolerance=0.25)
+    cleaner.df = cleaner.df.astype({'Facebook': object, 'Edad': object})
+    cleaner._clean_app_columns()
+    cleaner._clean_age_column()
+    assert cleaner.imputed_rows.tolist() == [False, True, True, True, False]
+    # Las filas 1 y 2 quedan imputadas con la misma mediana que la fila 0, y
+    # la 3 con la misma edad, pero solo la 4 es un casi duplicado real.
+    df = cleaner._remove_near_duplicates()
+    assert list(df.index) == [0, 1, 2, 3]
+
+
+def test_pipeline_dedups_rows_differing_only_in_format(tmp_path):
+    raw = pd.DataFrame({
+        'Edad': [20, '20', 20, 22],
+        'Genero (F/M/O)': ['F', 'f ', 'F', 'M'],
+        'Foraneo(Si/No)': ['No', 'NO', 'no', 'Si'],
+        'Regular(Si/No)': ['Si', 'Si', 'si', 'Si'],
+        'Sist. Operatvo': ['Android'] * 4,
+        'Facebook': [0.5, '.5', ' 0.5', 2.0],
+        'Instagram': [1, 1.0, '1', 3.0],
+    })
+    path = tmp_path / 'CDE.xlsx'
+    raw.to_excel(path, index=False)
+
+    df = CDEDataCleaner(str(path)).load_and_clean()
+    assert len(df) == 2
+    assert df['Facebook'].tolist() == [0.5, 2.0]